@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 
 from app.core.auth import verify_api_key
-from app.schemas.jobs import JobStatus
+from app.schemas.jobs import BatchJobStatusResponse, JobStatus
 from app.services import job_store
 
 router = APIRouter(
@@ -10,10 +13,25 @@ router = APIRouter(
     dependencies=[Depends(verify_api_key)],
 )
 
+MAX_BATCH_SIZE = 500
+
+
+# Statuses are returned as pre-serialized orjson responses: results can be large
+# (base64 thumbnails) and re-validating them through the response_model is
+# pure overhead. response_model is kept for the OpenAPI schema only.
+
+@router.post("/batch", response_model=BatchJobStatusResponse)
+async def get_job_statuses(
+    job_ids: List[str] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+):
+    """Poll many jobs at once. Unknown/expired jobs map to null."""
+    statuses = await job_store.get_statuses(job_ids)
+    return Response(content=orjson.dumps({"jobs": statuses}), media_type="application/json")
+
 
 @router.get("/{job_id}", response_model=JobStatus)
-def get_job_status(job_id: str):
-    status = job_store.get_status(job_id)
+async def get_job_status(job_id: str):
+    status = await job_store.get_status(job_id)
     if not status:
         raise HTTPException(status_code=404, detail="Job not found")
-    return status
+    return Response(content=orjson.dumps(status), media_type="application/json")
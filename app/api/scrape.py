@@ -1,12 +1,11 @@
-import uuid
+from typing import List
 
-from fastapi import APIRouter, Depends
-from rq import Queue
+from fastapi import APIRouter, Body, Depends
+from fastapi.concurrency import run_in_threadpool
 
 from app.core.auth import verify_api_key
-from app.core.redis import redis_conn
-from app.schemas.scrape import JobResponse, ScrapeRequest
-from app.services import job_store
+from app.schemas.scrape import BatchJobResponse, JobResponse, ScrapeRequest
+from app.services.enqueue import enqueue_jobs
 
 router = APIRouter(
     prefix="/search",
@@ -14,21 +13,27 @@ router = APIRouter(
     dependencies=[Depends(verify_api_key)],
 )
 
-queue = Queue("youtube_fetch_jobs", connection=redis_conn)
+MAX_BATCH_SIZE = 100
 
 
-@router.post("/scrape", response_model=JobResponse, status_code=202)
-def enqueue_scrape(request: ScrapeRequest):
-    job_id = str(uuid.uuid4())
-    job_store.create(job_id, "scrape")
-
-    queue.enqueue(
+def _enqueue(requests: List[ScrapeRequest]) -> List[str]:
+    return enqueue_jobs(
+        "scrape",
         "app.services.jobs.process_scrape_job",
-        job_id,
-        request.query,
-        request.max_results,
-        request.format,
+        [(r.query, r.max_results, r.format) for r in requests],
         job_timeout=120,
     )
 
-    return JobResponse(job_id=job_id)
+
+@router.post("/scrape", response_model=JobResponse, status_code=202)
+async def enqueue_scrape(request: ScrapeRequest):
+    job_ids = await run_in_threadpool(_enqueue, [request])
+    return JobResponse(job_id=job_ids[0])
+
+
+@router.post("/scrape/batch", response_model=BatchJobResponse, status_code=202)
+async def enqueue_scrape_batch(
+    requests: List[ScrapeRequest] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+):
+    job_ids = await run_in_threadpool(_enqueue, requests)
+    return BatchJobResponse(job_ids=job_ids)
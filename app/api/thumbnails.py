@@ -1,13 +1,12 @@
-import uuid
+from typing import List
 
-from fastapi import APIRouter, Depends
-from rq import Queue
+from fastapi import APIRouter, Body, Depends
+from fastapi.concurrency import run_in_threadpool
 
 from app.core.auth import verify_api_key
-from app.core.redis import redis_conn
-from app.schemas.scrape import JobResponse
+from app.schemas.scrape import BatchJobResponse, JobResponse
 from app.schemas.thumbnails import ThumbnailFetchRequest
-from app.services import job_store
+from app.services.enqueue import enqueue_jobs
 
 router = APIRouter(
     prefix="/thumbnails",
@@ -15,20 +14,27 @@ router = APIRouter(
     dependencies=[Depends(verify_api_key)],
 )
 
-queue = Queue("youtube_fetch_jobs", connection=redis_conn)
+MAX_BATCH_SIZE = 100
 
 
-@router.post("/fetch", response_model=JobResponse, status_code=202)
-def enqueue_thumbnail_fetch(request: ThumbnailFetchRequest):
-    job_id = str(uuid.uuid4())
-    job_store.create(job_id, "thumbnail")
-
-    queue.enqueue(
+def _enqueue(requests: List[ThumbnailFetchRequest]) -> List[str]:
+    return enqueue_jobs(
+        "thumbnail",
         "app.services.jobs.process_thumbnail_job",
-        job_id,
-        request.query,
-        request.max_thumbnails,
+        [(r.query, r.max_thumbnails) for r in requests],
         job_timeout=300,
     )
 
-    return JobResponse(job_id=job_id)
+
+@router.post("/fetch", response_model=JobResponse, status_code=202)
+async def enqueue_thumbnail_fetch(request: ThumbnailFetchRequest):
+    job_ids = await run_in_threadpool(_enqueue, [request])
+    return JobResponse(job_id=job_ids[0])
+
+
+@router.post("/fetch/batch", response_model=BatchJobResponse, status_code=202)
+async def enqueue_thumbnail_fetch_batch(
+    requests: List[ThumbnailFetchRequest] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+):
+    job_ids = await run_in_threadpool(_enqueue, requests)
+    return BatchJobResponse(job_ids=job_ids)
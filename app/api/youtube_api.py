@@ -29,10 +29,10 @@ _youtube_api = YouTubeDataAPI()
 
 
 @router.post("/videos", response_model=VideoDescriptionsResponse)
-def get_video_descriptions(request: VideoDescriptionsRequest):
+async def get_video_descriptions(request: VideoDescriptionsRequest):
     """Fetch full video descriptions from YouTube Data API v3."""
     try:
-        descriptions = _youtube_api.get_video_descriptions(request.video_ids)
+        descriptions = await _youtube_api.get_video_descriptions(request.video_ids)
         return VideoDescriptionsResponse(descriptions=descriptions)
     except Exception as e:
         if "YOUTUBE_QUOTA_EXCEEDED" in str(e):
@@ -41,10 +41,10 @@ def get_video_descriptions(request: VideoDescriptionsRequest):
 
 
 @router.post("/channels", response_model=ChannelSubscribersResponse)
-def get_channel_subscribers(request: ChannelSubscribersRequest):
+async def get_channel_subscribers(request: ChannelSubscribersRequest):
     """Fetch channel subscriber counts from YouTube Data API v3."""
     try:
-        subscribers = _youtube_api.get_channel_subscribers(request.channel_ids)
+        subscribers = await _youtube_api.get_channel_subscribers(request.channel_ids)
         return ChannelSubscribersResponse(subscribers=subscribers)
     except Exception as e:
         if "YOUTUBE_QUOTA_EXCEEDED" in str(e):
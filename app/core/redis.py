@@ -1,9 +1,61 @@
 import os
+from functools import lru_cache
 
 import redis
+import redis.asyncio
 
 REDIS_URL = os.getenv("REDIS_URL")
 if not REDIS_URL:
     raise ValueError("REDIS_URL environment variable is required")
 
-redis_conn = redis.from_url(REDIS_URL)
+# One pool per workload so a slow bulk operation in one cannot starve the others:
+# status = many small polls/updates, result = msgpack job results,
+# cache = API v3 / scrape result cache, rq = job enqueue and the RQ worker.
+STATUS_POOL_SIZE = 32
+RESULT_POOL_SIZE = 8
+CACHE_POOL_SIZE = 8
+RQ_POOL_SIZE = 8
+
+
+# Clients are built on first use, inside the process that uses them, so
+# connection pools are never shared across uvicorn/RQ worker processes.
+
+def _async_client(max_connections: int, decode_responses: bool) -> redis.asyncio.Redis:
+    pool = redis.asyncio.BlockingConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=max_connections,
+        decode_responses=decode_responses,
+    )
+    return redis.asyncio.Redis(connection_pool=pool)
+
+
+@lru_cache(maxsize=None)
+def get_status_redis() -> redis.asyncio.Redis:
+    """Job status hashes and API key rotation state (str values)."""
+    return _async_client(STATUS_POOL_SIZE, decode_responses=True)
+
+
+@lru_cache(maxsize=None)
+def get_result_redis() -> redis.asyncio.Redis:
+    """Job result blobs (raw bytes)."""
+    return _async_client(RESULT_POOL_SIZE, decode_responses=False)
+
+
+@lru_cache(maxsize=None)
+def get_cache_redis() -> redis.asyncio.Redis:
+    """YouTube Data API and scrape result cache (raw bytes)."""
+    return _async_client(CACHE_POOL_SIZE, decode_responses=False)
+
+
+@lru_cache(maxsize=None)
+def get_rq_redis() -> redis.Redis:
+    # RQ only works with the synchronous client. Keepalive + health checks let
+    # the worker's long-lived connection survive idle periods between jobs
+    # (RQ raises socket_timeout itself to cover its blocking dequeue).
+    pool = redis.BlockingConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=RQ_POOL_SIZE,
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+    return redis.Redis(connection_pool=pool)
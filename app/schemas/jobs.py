@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
 
@@ -8,3 +8,7 @@ class JobStatus(BaseModel):
     progress: int = 0
     result: Optional[Any] = None
     error: Optional[str] = None
+
+
+class BatchJobStatusResponse(BaseModel):
+    jobs: Dict[str, Optional[JobStatus]]
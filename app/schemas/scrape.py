@@ -1,4 +1,4 @@
-from typing import Literal, Optional
+from typing import List, Literal
 
 from pydantic import BaseModel, Field
 
@@ -11,3 +11,7 @@ class ScrapeRequest(BaseModel):
 
 class JobResponse(BaseModel):
     job_id: str
+
+
+class BatchJobResponse(BaseModel):
+    job_ids: List[str]
@@ -3,18 +3,26 @@
 from typing import Dict, List
 
 from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
+
+# Split into chunks of 50 (the API v3 limit) and fetched concurrently
+MAX_IDS = 500
 
 
 class VideoDescriptionsRequest(BaseModel):
-    video_ids: List[str] = Field(..., min_length=1, max_length=50)
+    video_ids: List[str] = Field(..., min_length=1, max_length=MAX_IDS)
+
+
+class VideoDescription(TypedDict):
+    description: str
 
 
 class VideoDescriptionsResponse(BaseModel):
-    descriptions: Dict[str, Dict]
+    descriptions: Dict[str, VideoDescription]
 
 
 class ChannelSubscribersRequest(BaseModel):
-    channel_ids: List[str] = Field(..., min_length=1, max_length=50)
+    channel_ids: List[str] = Field(..., min_length=1, max_length=MAX_IDS)
 
 
 class ChannelSubscribersResponse(BaseModel):
@@ -0,0 +1,44 @@
+"""Atomic RQ enqueue: status hash + RQ job written in one MULTI/EXEC round trip."""
+
+import uuid
+from typing import Iterable, List, Tuple
+
+from rq import Queue
+
+from app.core.redis import get_rq_redis
+from app.services import job_store
+
+QUEUE_NAME = "youtube_fetch_jobs"
+
+
+def get_queue() -> Queue:
+    return Queue(QUEUE_NAME, connection=get_rq_redis())
+
+
+def enqueue_jobs(
+    job_type: str, func: str, args_list: Iterable[Tuple], job_timeout: int
+) -> List[str]:
+    """Create one status hash + RQ job per args tuple, all in a single transaction.
+
+    MULTI/EXEC makes the status and the queued job land together: a crash can
+    no longer leave a "queued" status with no RQ job behind it.
+    Each job function is called as func(job_id, *args). Returns the job ids in order.
+    """
+    job_ids: List[str] = []
+    job_datas = []
+
+    queue = get_queue()
+
+    with queue.connection.pipeline(transaction=True) as pipe:
+        for args in args_list:
+            job_id = str(uuid.uuid4())
+            job_store.stage_create(pipe, job_id, job_type)
+            job_datas.append(Queue.prepare_data(
+                func, args=(job_id, *args), timeout=job_timeout,
+            ))
+            job_ids.append(job_id)
+
+        queue.enqueue_many(job_datas, pipeline=pipe)
+        pipe.execute()
+
+    return job_ids
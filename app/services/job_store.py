@@ -1,15 +1,18 @@
 """Redis-backed job status store for tracking RQ job progress.
 
 Each job is stored as a Redis hash: yt_job:{job_id}
-Fields: status, progress, result (JSON), error, job_type
+Fields (short names to keep the hash small): s=status, p=progress, t=job_type, e=error
+The result is a separate msgpack blob: yt_job:{job_id}:result
 TTL: 1 hour after completion.
 """
 
-import json
 import logging
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
-from app.core.redis import redis_conn
+import msgpack
+from redis.client import Pipeline
+
+from app.core.redis import get_result_redis, get_status_redis
 
 logger = logging.getLogger(__name__)
 
@@ -21,58 +24,92 @@ def _key(job_id: str) -> str:
     return f"{JOB_KEY_PREFIX}{job_id}"
 
 
-def create(job_id: str, job_type: str) -> None:
-    redis_conn.hset(_key(job_id), mapping={
-        "status": "queued",
-        "progress": 0,
-        "job_type": job_type,
-    })
+def _result_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}:result"
 
 
-def update_progress(job_id: str, progress: int) -> None:
-    redis_conn.hset(_key(job_id), mapping={
-        "status": "running",
-        "progress": progress,
+def stage_create(pipe: Pipeline, job_id: str, job_type: str) -> None:
+    """Queue the initial status HSET on a caller-owned sync transaction (see enqueue.py)."""
+    pipe.hset(_key(job_id), mapping={
+        "s": "queued",
+        "p": 0,
+        "t": job_type,
     })
 
 
-def complete(job_id: str, result: Any) -> None:
-    key = _key(job_id)
-    redis_conn.hset(key, mapping={
-        "status": "done",
-        "progress": 100,
-        "result": json.dumps(result),
+async def update_progress(job_id: str, progress: int) -> None:
+    await get_status_redis().hset(_key(job_id), mapping={
+        "s": "running",
+        "p": progress,
     })
-    redis_conn.expire(key, JOB_TTL_SECONDS)
 
 
-def fail(job_id: str, error: str) -> None:
+async def complete(job_id: str, result: Any) -> None:
+    # Result first: a poller that sees "done" must always find the result blob
+    await get_result_redis().set(
+        _result_key(job_id),
+        msgpack.packb(result, use_bin_type=True),
+        ex=JOB_TTL_SECONDS,
+    )
     key = _key(job_id)
-    redis_conn.hset(key, mapping={
-        "status": "failed",
-        "progress": 0,
-        "error": error,
-    })
-    redis_conn.expire(key, JOB_TTL_SECONDS)
+    async with get_status_redis().pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping={
+            "s": "done",
+            "p": 100,
+        })
+        pipe.expire(key, JOB_TTL_SECONDS)
+        await pipe.execute()
 
 
-def get_status(job_id: str) -> Optional[dict]:
+async def fail(job_id: str, error: str) -> None:
     key = _key(job_id)
-    data = redis_conn.hgetall(key)
-    if not data:
-        return None
-
-    status = {
-        "status": data.get(b"status", b"unknown").decode(),
-        "progress": int(data.get(b"progress", b"0")),
+    async with get_status_redis().pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping={
+            "s": "failed",
+            "p": 0,
+            "e": error,
+        })
+        pipe.expire(key, JOB_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def get_status(job_id: str) -> Optional[dict]:
+    statuses = await get_statuses([job_id])
+    return statuses[job_id]
+
+
+async def get_statuses(job_ids: List[str]) -> Dict[str, Optional[dict]]:
+    """Fetch many job statuses: one HGETALL pipeline, then one MGET for the result
+    blobs of the jobs that are done.
+
+    The hashes are read first on purpose: complete() writes the result before
+    flipping the status, so a job seen as "done" always has its result readable.
+    """
+    async with get_status_redis().pipeline(transaction=False) as pipe:
+        for job_id in job_ids:
+            pipe.hgetall(_key(job_id))
+        hashes = await pipe.execute()
+
+    done_ids = [job_id for job_id, data in zip(job_ids, hashes) if data.get("s") == "done"]
+    results: Dict[str, Optional[bytes]] = {}
+    if done_ids:
+        blobs = await get_result_redis().mget([_result_key(job_id) for job_id in done_ids])
+        results = dict(zip(done_ids, blobs))
+
+    return {
+        job_id: _parse_status(data, results.get(job_id))
+        for job_id, data in zip(job_ids, hashes)
     }
 
-    result_raw = data.get(b"result")
-    if result_raw:
-        status["result"] = json.loads(result_raw)
 
-    error_raw = data.get(b"error")
-    if error_raw:
-        status["error"] = error_raw.decode()
+def _parse_status(data: dict, result_raw: Optional[bytes]) -> Optional[dict]:
+    if not data:
+        return None
 
-    return status
+    # Same shape as schemas.jobs.JobStatus: the API serializes this dict directly
+    return {
+        "status": data.get("s", "unknown"),
+        "progress": int(data.get("p", 0)),
+        "result": msgpack.unpackb(result_raw, raw=False) if result_raw else None,
+        "error": data.get("e") or None,
+    }
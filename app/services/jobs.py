@@ -1,29 +1,95 @@
 """RQ job functions executed by the worker.
 
 Each function receives a job_id + parameters, processes the task,
-and stores the result in Redis via job_store.
+and stores the result in Redis via job_store. RQ calls these synchronously,
+so each one drives its async body on a process-wide event loop: the worker
+runs jobs in-process (SimpleWorker), and the cached async Redis/httpx clients
+are bound to the loop that created them, so one loop is kept for the life of
+the process rather than a fresh one per job.
+
+Because the loop outlives each job, a job body must never be left running on
+it: it runs under an asyncio timeout just below the RQ job_timeout, and any
+tasks still pending when the job returns (or RQ's SIGALRM timeout fires inside
+the loop) are cancelled before the next job starts.
 """
 
+import asyncio
 import logging
+from typing import Coroutine, Optional
+
+from rq import get_current_job
+from rq.timeouts import JobTimeoutException
 
 from app.services import job_store
 from app.services.thumbnail_fetcher import fetch_thumbnails
-from app.services.youtube_scraper import scrape_search
+from app.services.youtube_scraper import scrape_search_async
 
 logger = logging.getLogger(__name__)
 
+# Seconds kept back from the RQ job_timeout so the asyncio timeout fires first
+# and the job is failed cleanly instead of being killed by SIGALRM.
+JOB_TIMEOUT_MARGIN = 5
+
+_runner = asyncio.Runner()
+
 
 def process_scrape_job(job_id: str, query: str, max_results: int, output_format: str) -> None:
+    _run_job(job_id, _scrape_job(job_id, query, max_results, output_format))
+
+
+def process_thumbnail_job(job_id: str, query: str, max_thumbnails: int) -> None:
+    _run_job(job_id, _thumbnail_job(job_id, query, max_thumbnails))
+
+
+def _run_job(job_id: str, body: Coroutine) -> None:
     try:
-        job_store.update_progress(job_id, 10)
+        _runner.run(_with_timeout(job_id, body, _job_budget()))
+    except JobTimeoutException:
+        # RQ's alarm fired inside the loop, outside the job coroutine
+        _cancel_pending_tasks()
+        _runner.run(job_store.fail(job_id, "Job timed out"))
+        raise
+    finally:
+        _cancel_pending_tasks()
+
+
+def _job_budget() -> Optional[float]:
+    job = get_current_job()
+    if job is None or job.timeout is None or job.timeout < 0:
+        return None
+    return max(job.timeout - JOB_TIMEOUT_MARGIN, 1)
 
-        result = scrape_search(query, max_results, output_format)
+
+async def _with_timeout(job_id: str, body: Coroutine, timeout: Optional[float]) -> None:
+    try:
+        async with asyncio.timeout(timeout):
+            await body
+    except TimeoutError:
+        logger.error(f"Job {job_id} timed out after {timeout}s")
+        await job_store.fail(job_id, f"Job timed out after {timeout}s")
+
+
+def _cancel_pending_tasks() -> None:
+    loop = _runner.get_loop()
+    tasks = asyncio.all_tasks(loop)
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+
+async def _scrape_job(job_id: str, query: str, max_results: int, output_format: str) -> None:
+    try:
+        await job_store.update_progress(job_id, 10)
+
+        result = await scrape_search_async(query, max_results, output_format)
 
         if result is None:
-            job_store.fail(job_id, f"YouTube scrape failed for query: {query}")
+            await job_store.fail(job_id, f"YouTube scrape failed for query: {query}")
             return
 
-        job_store.complete(job_id, {
+        await job_store.complete(job_id, {
             "success": True,
             "estimated_results": result["estimated_results"],
             "videos": result["videos"],
@@ -31,21 +97,21 @@ def process_scrape_job(job_id: str, query: str, max_results: int, output_format:
 
     except Exception as e:
         logger.exception(f"Scrape job {job_id} failed")
-        job_store.fail(job_id, str(e))
+        await job_store.fail(job_id, str(e))
 
 
-def process_thumbnail_job(job_id: str, query: str, max_thumbnails: int) -> None:
+async def _thumbnail_job(job_id: str, query: str, max_thumbnails: int) -> None:
     try:
-        job_store.update_progress(job_id, 10)
+        await job_store.update_progress(job_id, 10)
 
-        result = fetch_thumbnails(query, max_thumbnails)
+        result = await fetch_thumbnails(query, max_thumbnails)
 
         if result is None:
-            job_store.fail(job_id, f"Thumbnail fetch failed for query: {query}")
+            await job_store.fail(job_id, f"Thumbnail fetch failed for query: {query}")
             return
 
-        job_store.complete(job_id, result)
+        await job_store.complete(job_id, result)
 
     except Exception as e:
         logger.exception(f"Thumbnail job {job_id} failed")
-        job_store.fail(job_id, str(e))
+        await job_store.fail(job_id, str(e))
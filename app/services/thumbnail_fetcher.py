@@ -5,7 +5,6 @@ instead of the YouTube Data API v3.
 """
 
 import asyncio
-import base64
 import logging
 import os
 import re
@@ -14,15 +13,26 @@ from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote
 
 import httpx
+import pybase64
 
-from app.services.youtube_scraper import scrape_search
+from app.services.youtube_scraper import scrape_search_async
 
 logger = logging.getLogger(__name__)
 
-CONCURRENT_DOWNLOADS = 10
+MAX_CONNECTIONS = 10
+MAX_KEEPALIVE_CONNECTIONS = 4
 DOWNLOAD_TIMEOUT = 30.0
+DEBUG_THUMBNAILS = bool(os.getenv("DEBUG_THUMBNAILS"))
 DEBUG_THUMBNAILS_DIR = "/app/cache/debug-thumbnails"
 
+_SANITIZE_RE = re.compile(r"[^\w\s-]")
+
+# (prefix, media type), checked against the first 12 bytes of the image
+_MAGIC_PREFIXES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8", "image/jpeg"),
+)
+
 MEDIA_EXTENSIONS = {
     "image/webp": ".webp",
     "image/png": ".png",
@@ -32,26 +42,34 @@ MEDIA_EXTENSIONS = {
 
 async def _download_thumbnail(
     client: httpx.AsyncClient, url: str
-) -> Optional[Tuple[bytes, str]]:
+) -> Optional[Tuple[bytearray, str]]:
     try:
-        response = await client.get(url)
-        response.raise_for_status()
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            # Pre-size from Content-Length; slice assignment grows it if the hint is short
+            data = bytearray(int(response.headers.get("content-length", 0)))
+            size = 0
+            async for chunk in response.aiter_bytes():
+                data[size:size + len(chunk)] = chunk
+                size += len(chunk)
+            del data[size:]
+
         content_type = response.headers.get("content-type", "")
-        media_type = _detect_media_type(response.content, content_type)
-        return response.content, media_type
+        media_type = _detect_media_type(data, content_type)
+        return data, media_type
     except httpx.HTTPError as e:
-        logger.warning(f"Failed to download thumbnail {url}: {e}")
+        logger.warning("Failed to download thumbnail %s: %s", url, e)
         return None
 
 
-def _detect_media_type(data: bytes, content_type: str) -> str:
+def _detect_media_type(data: bytearray, content_type: str) -> str:
     """Detect actual media type from file magic bytes."""
-    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+    header = bytes(data[:12])
+    if header[:4] == b"RIFF" and header[8:] == b"WEBP":
         return "image/webp"
-    if data[:8] == b"\x89PNG\r\n\x1a\n":
-        return "image/png"
-    if data[:2] == b"\xff\xd8":
-        return "image/jpeg"
+    for prefix, media_type in _MAGIC_PREFIXES:
+        if header.startswith(prefix):
+            return media_type
 
     if "webp" in content_type:
         return "image/webp"
@@ -62,7 +80,7 @@ def _detect_media_type(data: bytes, content_type: str) -> str:
 
 
 def _sanitize_filename(text: str) -> str:
-    return re.sub(r'[^\w\s-]', '', text).strip().replace(' ', '_')[:80]
+    return _SANITIZE_RE.sub('', text).strip().replace(' ', '_')[:80]
 
 
 def _log_scrape_results(query: str, videos: List[Dict]) -> None:
@@ -76,55 +94,73 @@ def _log_scrape_results(query: str, videos: List[Dict]) -> None:
         logger.info(f"  [{i+1:02d}] {title} | {views:,} views | {video_id}")
 
 
-def _save_thumbnails_to_disk(
-    query: str, thumbnails: List[Dict]
+def _write_file(filepath: str, data: bytearray) -> None:
+    with open(filepath, "wb") as f:
+        f.write(data)
+
+
+async def _save_thumbnails_to_disk(
+    query: str, downloads: List[Tuple[str, bytearray, str]]
 ) -> None:
+    """Write images off the event loop, one thread per file so the writes overlap."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     slug = _sanitize_filename(query)
     folder = os.path.join(DEBUG_THUMBNAILS_DIR, f"{timestamp}_{slug}")
-    os.makedirs(folder, exist_ok=True)
+    await asyncio.to_thread(os.makedirs, folder, exist_ok=True)
 
-    for i, thumb in enumerate(thumbnails):
-        ext = MEDIA_EXTENSIONS.get(thumb["media_type"], ".jpg")
-        video_id = thumb["url"].split("/vi/")[-1].split("/")[0]
+    writes = []
+    for i, (url, data, media_type) in enumerate(downloads):
+        ext = MEDIA_EXTENSIONS.get(media_type, ".jpg")
+        video_id = url.split("/vi/")[-1].split("/")[0]
         filepath = os.path.join(folder, f"{i+1:02d}_{video_id}{ext}")
-        with open(filepath, "wb") as f:
-            f.write(base64.standard_b64decode(thumb["base64"]))
+        writes.append(asyncio.to_thread(_write_file, filepath, data))
+    await asyncio.gather(*writes)
 
-    logger.info(f"[THUMBNAILS] Saved {len(thumbnails)} images to {folder}")
+    logger.info(f"[THUMBNAILS] Saved {len(downloads)} images to {folder}")
 
 
-async def _download_all(thumbnail_urls: List[str], max_thumbnails: int) -> List[Dict]:
-    transport = httpx.AsyncHTTPTransport(retries=3)
-    async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT, transport=transport) as client:
-        semaphore = asyncio.Semaphore(CONCURRENT_DOWNLOADS)
+def _encode_thumbnails(downloads: List[Tuple[str, bytearray, str]]) -> List[Dict]:
+    return [
+        {
+            "url": url,
+            "base64": pybase64.b64encode_as_string(data),
+            "media_type": media_type,
+        }
+        for url, data, media_type in downloads
+    ]
 
-        async def download_with_limit(url: str) -> Tuple[str, Optional[Tuple[bytes, str]]]:
-            async with semaphore:
-                result = await _download_thumbnail(client, url)
-                return url, result
 
-        tasks = [download_with_limit(url) for url in thumbnail_urls]
+async def _download_all(
+    thumbnail_urls: List[str], max_thumbnails: int
+) -> List[Tuple[str, bytearray, str]]:
+    # i.ytimg.com speaks HTTP/2: all downloads multiplex over a few connections,
+    # and the pool limits bound concurrency.
+    transport = httpx.AsyncHTTPTransport(
+        retries=3,
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=MAX_CONNECTIONS,
+        ),
+    )
+    async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT, transport=transport) as client:
+        tasks = [_download_thumbnail(client, url) for url in thumbnail_urls]
         results = await asyncio.gather(*tasks)
 
-    thumbnails = []
-    for url, result in results:
-        if result and len(thumbnails) < max_thumbnails:
+    downloads = []
+    for url, result in zip(thumbnail_urls, results):
+        if result and len(downloads) < max_thumbnails:
             data, media_type = result
-            thumbnails.append({
-                "url": url,
-                "base64": base64.standard_b64encode(data).decode("utf-8"),
-                "media_type": media_type,
-            })
+            downloads.append((url, data, media_type))
 
-    return thumbnails
+    return downloads
 
 
-def fetch_thumbnails(query: str, max_thumbnails: int = 20) -> Optional[Dict]:
+async def fetch_thumbnails(query: str, max_thumbnails: int = 20) -> Optional[Dict]:
     """Scrape YouTube search, extract thumbnail URLs, download and encode as base64."""
     logger.info(f"[THUMBNAILS] Query: '{query}' (max: {max_thumbnails})")
 
-    scrape_result = scrape_search(query, max_results=max_thumbnails + 5)
+    scrape_result = await scrape_search_async(query, max_results=max_thumbnails + 5)
     if not scrape_result:
         logger.error(f"Scrape failed for thumbnail query: {query}")
         return None
@@ -141,13 +177,20 @@ def fetch_thumbnails(query: str, max_thumbnails: int = 20) -> Optional[Dict]:
         logger.warning(f"No thumbnail URLs found for query: {query}")
         return None
 
-    thumbnails = asyncio.run(_download_all(thumbnail_urls, max_thumbnails))
+    downloads = await _download_all(thumbnail_urls, max_thumbnails)
 
-    if not thumbnails:
+    if not downloads:
         logger.error(f"Failed to download any thumbnails for query: {query}")
         return None
 
-    _save_thumbnails_to_disk(query, thumbnails)
+    if DEBUG_THUMBNAILS:
+        # Encode on a worker thread so the disk writes actually run alongside it
+        thumbnails, _ = await asyncio.gather(
+            asyncio.to_thread(_encode_thumbnails, downloads),
+            _save_thumbnails_to_disk(query, downloads),
+        )
+    else:
+        thumbnails = _encode_thumbnails(downloads)
 
     return {
         "query": query,
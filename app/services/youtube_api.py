@@ -1,26 +1,54 @@
-"""YouTube Data API v3 service with multi-key rotation and file cache.
+"""YouTube Data API v3 service with multi-key rotation and Redis response cache.
 
 Centralizes all YouTube Data API v3 calls behind youtube-fetcher.
 Supports up to 12 API keys with automatic rotation on quota exhaustion.
+Rotation state (exhausted keys + cursor) lives in Redis so every uvicorn
+worker shares it instead of rediscovering exhausted keys on its own.
+
+MOCK mode serves the Redis cache first, then JSON fixture files from
+YOUTUBE_CACHE_DIR, so a fresh dev environment is not limited to what LIVE
+cached in the last 24h. LIVE only records fixtures when YOUTUBE_RECORD_FIXTURES
+is set; otherwise it does no disk I/O.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
 import os
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+import orjson
+import xxhash
 
-import requests
+from app.core.redis import get_cache_redis, get_status_redis
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://www.googleapis.com/youtube/v3"
+REQUEST_TIMEOUT = 10.0
+MAX_IDS_PER_REQUEST = 50
+CACHE_KEY_PREFIX = "ytapi:"
+CACHE_TTL_SECONDS = 86400
+
+EXHAUSTED_KEYS_KEY = "yt:api:exhausted"
+KEY_CURSOR_KEY = "yt:api:cursor"
+EXHAUSTED_TTL_SECONDS = 3600
+ROTATION_STATE_TTL = 5.0
+
+# Shared across calls: HTTP/2 multiplexes concurrent API requests over one TLS connection
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=REQUEST_TIMEOUT,
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
 
 
 class YouTubeDataAPI:
-    """YouTube Data API v3 with multi-key rotation and file-based caching."""
+    """YouTube Data API v3 with multi-key rotation and Redis caching."""
 
     def __init__(self):
         mode = os.getenv("YOUTUBE_MODE")
@@ -28,11 +56,18 @@ class YouTubeDataAPI:
             raise ValueError("YOUTUBE_MODE is required (LIVE or MOCK)")
         self.mode = mode.upper()
 
-        cache_dir_env = os.getenv("YOUTUBE_CACHE_DIR")
-        if not cache_dir_env:
-            raise ValueError("YOUTUBE_CACHE_DIR is required")
-        self.cache_dir = Path(cache_dir_env)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_dir = os.getenv("YOUTUBE_CACHE_DIR")
+        self.fixture_dir: Optional[Path] = Path(cache_dir) if cache_dir else None
+        self.record_fixtures = bool(os.getenv("YOUTUBE_RECORD_FIXTURES"))
+        if self.record_fixtures:
+            if not self.fixture_dir:
+                raise ValueError("YOUTUBE_RECORD_FIXTURES requires YOUTUBE_CACHE_DIR")
+            self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        if self.mode == "MOCK" and not self.fixture_dir:
+            logger.warning(
+                "MOCK mode without YOUTUBE_CACHE_DIR: only responses cached in Redis "
+                "by LIVE mode (24h TTL) will be served"
+            )
 
         if self.mode != "MOCK":
             self._init_api_keys()
@@ -43,51 +78,51 @@ class YouTubeDataAPI:
         )
 
     def _init_api_keys(self):
-        self.api_keys: List[str] = []
+        keys = []
         for i in range(1, 13):
             key = os.getenv(f"YOUTUBE_API_KEY_{i}")
             if key and key.strip():
-                self.api_keys.append(key.strip())
+                keys.append(key.strip())
 
-        if not self.api_keys:
+        if not keys:
             raise ValueError("At least one YOUTUBE_API_KEY_N is required (1-12)")
 
+        self.api_keys: Tuple[str, ...] = tuple(keys)
+        # Hashed once here; Redis state is keyed by these ids
+        self._key_ids: Tuple[str, ...] = tuple(_key_id(k) for k in keys)
+
         self.current_key_index = 0
-        self.exhausted_keys: set = set()
+        self.exhausted_keys: Set[int] = set()  # indices into api_keys
+        self._rotation_state_expires_at = 0.0
 
-    def make_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict]:
+    async def make_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict]:
         """Make a YouTube Data API request with key rotation and caching."""
         cache_key = self._get_cache_key(endpoint, params)
 
         if self.mode == "MOCK":
-            return self._load_from_cache(cache_key)
-
-        available_keys = [k for k in self.api_keys if k not in self.exhausted_keys]
-        if not available_keys:
-            raise Exception("YOUTUBE_QUOTA_EXCEEDED")
+            cached = await self._load_from_cache(cache_key)
+            if cached is None and self.fixture_dir:
+                cached = await asyncio.to_thread(self._load_fixture, endpoint, params)
+            return cached
 
-        if self.api_keys[self.current_key_index] in self.exhausted_keys:
-            self._rotate_to_available_key()
+        await self._load_rotation_state()
 
-        for _ in range(len(available_keys)):
-            current_key = self.api_keys[self.current_key_index]
-            if current_key in self.exhausted_keys:
-                self._rotate_to_available_key()
-                continue
-
-            params["key"] = current_key
-            response = requests.get(f"{BASE_URL}/{endpoint}", params=params)
+        for _ in range(len(self.api_keys)):
+            key_index = self._pick_available_key()
+            params["key"] = self.api_keys[key_index]
+            response = await _client.get(f"{BASE_URL}/{endpoint}", params=params)
 
             if response.status_code == 200:
                 result = response.json()
-                self._save_to_cache(cache_key, result)
+                await self._save_to_cache(cache_key, result)
+                if self.record_fixtures:
+                    await asyncio.to_thread(self._save_fixture, endpoint, params, result)
                 return result
 
             if response.status_code == 403:
-                self.exhausted_keys.add(current_key)
-                logger.warning(f"YouTube key {self.current_key_index + 1} exhausted")
-                self._rotate_to_available_key()
-                time.sleep(0.5)
+                logger.warning(f"YouTube key {key_index + 1} exhausted")
+                await self._mark_exhausted(key_index)
+                await asyncio.sleep(0.5)
                 continue
 
             logger.error(f"YouTube API error {response.status_code}: {response.text}")
@@ -95,63 +130,106 @@ class YouTubeDataAPI:
 
         raise Exception("YOUTUBE_QUOTA_EXCEEDED")
 
-    def get_video_descriptions(self, video_ids: List[str]) -> Dict[str, Dict]:
-        """Fetch full descriptions for a batch of video IDs (max 50)."""
-        if not video_ids:
-            return {}
-
-        result = self.make_request(
-            "videos", {"part": "snippet", "id": ",".join(video_ids[:50])}
-        )
-        if not result or "items" not in result:
-            return {}
+    async def get_video_descriptions(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch full descriptions for any number of video IDs (50 per API call, in parallel)."""
+        items = await self._fetch_items("videos", "snippet", video_ids)
 
         descriptions: Dict[str, Dict] = {}
-        for item in result["items"]:
+        for item in items:
             snippet = item.get("snippet")
             if snippet and "description" in snippet:
                 descriptions[item["id"]] = {"description": snippet["description"]}
         return descriptions
 
-    def get_channel_subscribers(self, channel_ids: List[str]) -> Dict[str, int]:
-        """Fetch subscriber counts for a batch of channel IDs (max 50)."""
-        if not channel_ids:
-            return {}
-
-        result = self.make_request(
-            "channels", {"part": "statistics", "id": ",".join(channel_ids[:50])}
-        )
-        if not result or "items" not in result:
-            return {}
+    async def get_channel_subscribers(self, channel_ids: List[str]) -> Dict[str, int]:
+        """Fetch subscriber counts for any number of channel IDs (50 per API call, in parallel)."""
+        items = await self._fetch_items("channels", "statistics", channel_ids)
 
         subs_map: Dict[str, int] = {}
-        for item in result["items"]:
+        for item in items:
             statistics = item.get("statistics")
             if statistics and "subscriberCount" in statistics:
                 subs_map[item["id"]] = int(statistics["subscriberCount"])
         return subs_map
 
-    def _rotate_to_available_key(self):
+    async def _fetch_items(self, endpoint: str, part: str, ids: List[str]) -> List[Dict]:
+        """Split ids into API-sized chunks, request them concurrently, merge the items."""
+        chunks = [ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(ids), MAX_IDS_PER_REQUEST)]
+        results = await asyncio.gather(*[
+            self.make_request(endpoint, {"part": part, "id": ",".join(chunk)})
+            for chunk in chunks
+        ])
+
+        items: List[Dict] = []
+        for result in results:
+            if result and "items" in result:
+                items.extend(result["items"])
+        return items
+
+    def _pick_available_key(self) -> int:
         for i in range(len(self.api_keys)):
-            idx = (self.current_key_index + 1 + i) % len(self.api_keys)
-            if self.api_keys[idx] not in self.exhausted_keys:
-                self.current_key_index = idx
-                return
+            idx = (self.current_key_index + i) % len(self.api_keys)
+            if idx not in self.exhausted_keys:
+                return idx
         raise Exception("YOUTUBE_QUOTA_EXCEEDED")
 
+    async def _load_rotation_state(self):
+        """Refresh exhausted keys + cursor from Redis, at most every ROTATION_STATE_TTL seconds."""
+        now = time.monotonic()
+        if now < self._rotation_state_expires_at:
+            return
+
+        async with get_status_redis().pipeline(transaction=False) as pipe:
+            pipe.smembers(EXHAUSTED_KEYS_KEY)
+            pipe.get(KEY_CURSOR_KEY)
+            exhausted, cursor = await pipe.execute()
+
+        self.exhausted_keys = {
+            i for i, key_id in enumerate(self._key_ids) if key_id in exhausted
+        }
+        self.current_key_index = int(cursor or 0) % len(self.api_keys)
+        self._rotation_state_expires_at = now + ROTATION_STATE_TTL
+
+    async def _mark_exhausted(self, key_index: int):
+        async with get_status_redis().pipeline(transaction=False) as pipe:
+            pipe.sadd(EXHAUSTED_KEYS_KEY, self._key_ids[key_index])
+            pipe.expire(EXHAUSTED_KEYS_KEY, EXHAUSTED_TTL_SECONDS)
+            pipe.incr(KEY_CURSOR_KEY)
+            _, _, cursor = await pipe.execute()
+
+        self.exhausted_keys.add(key_index)
+        self.current_key_index = cursor % len(self.api_keys)
+
     def _get_cache_key(self, endpoint: str, params: Dict) -> str:
+        cache_params = {k: v for k, v in params.items() if k != "key"}
+        raw = endpoint.encode() + b"_" + orjson.dumps(cache_params, option=orjson.OPT_SORT_KEYS)
+        return xxhash.xxh3_128_hexdigest(raw)
+
+    async def _save_to_cache(self, cache_key: str, data: Dict):
+        await get_cache_redis().set(
+            f"{CACHE_KEY_PREFIX}{cache_key}", orjson.dumps(data), ex=CACHE_TTL_SECONDS
+        )
+
+    async def _load_from_cache(self, cache_key: str) -> Optional[Dict]:
+        raw = await get_cache_redis().get(f"{CACHE_KEY_PREFIX}{cache_key}")
+        return orjson.loads(raw) if raw else None
+
+    def _fixture_path(self, endpoint: str, params: Dict) -> Path:
+        # Same naming as the former file cache, so existing fixture dirs keep working
         cache_params = {k: v for k, v in params.items() if k != "key"}
         raw = f"{endpoint}_{json.dumps(cache_params, sort_keys=True)}"
-        return hashlib.md5(raw.encode()).hexdigest()
-
-    def _save_to_cache(self, cache_key: str, data: Dict):
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-    def _load_from_cache(self, cache_key: str) -> Optional[Dict]:
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            with open(cache_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return None
+        return self.fixture_dir / f"{hashlib.md5(raw.encode()).hexdigest()}.json"
+
+    def _save_fixture(self, endpoint: str, params: Dict, data: Dict):
+        self._fixture_path(endpoint, params).write_bytes(orjson.dumps(data))
+
+    def _load_fixture(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        try:
+            return orjson.loads(self._fixture_path(endpoint, params).read_bytes())
+        except FileNotFoundError:
+            return None
+
+
+def _key_id(key: str) -> str:
+    """Short non-reversible id for an API key, so raw keys never land in Redis."""
+    return xxhash.xxh3_64_hexdigest(key.encode())
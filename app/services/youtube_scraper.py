@@ -7,18 +7,30 @@ Merged from:
 Supports two output formats:
 - "standard": snake_case keys, views parsed as int (for niche-finder, thumbnails)
 - "tubebuddy": PascalCase keys matching TubeBuddy API expectations (for yt-scorer)
+
+Parsing: ytInitialData is parsed by simdjson into lazy proxies, so only the
+fields read below are ever converted to Python objects, and each videoRenderer
+is walked exactly once (_extract_fields) whatever the output format.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
+import random
 import re
-from typing import Any, Dict, List, Optional
+import time
+import weakref
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
 from urllib.parse import quote
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import httpx
+import orjson
+import simdjson
+
+from app.core.redis import get_cache_redis
 
 logger = logging.getLogger(__name__)
 
@@ -31,51 +43,196 @@ if not YOUTUBE_USER_AGENT:
     raise ValueError("YOUTUBE_USER_AGENT is required")
 
 
-def _create_session() -> requests.Session:
-    session = requests.Session()
-    retry = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-    session.mount("https://", HTTPAdapter(max_retries=retry))
-    session.headers.update({
-        "User-Agent": YOUTUBE_USER_AGENT,
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cookie": YOUTUBE_COOKIES,
-    })
-    return session
+REQUEST_HEADERS = {
+    "User-Agent": YOUTUBE_USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.9",
+    # Brotli pages are ~15% smaller than gzip (decoded via the brotli package)
+    "Accept-Encoding": "gzip, br",
+    "Cookie": YOUTUBE_COOKIES,
+}
+REQUEST_TIMEOUT = 30
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 1.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_DELAY_MAX = RETRY_BACKOFF * 2 ** RETRY_TOTAL
+SCRAPE_CACHE_PREFIX = "ytscrape:"
+SCRAPE_CACHE_TTL_SECONDS = 6 * 3600
+
+
+# httpx async clients are bound to the event loop they were first used on:
+# keep one shared HTTP/2 client per loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        # Transport retries cover connection failures; the loop in
+        # scrape_search_async retries read errors and retryable statuses.
+        transport = httpx.AsyncHTTPTransport(
+            retries=RETRY_TOTAL,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+        client = httpx.AsyncClient(
+            headers=REQUEST_HEADERS,
+            timeout=REQUEST_TIMEOUT,
+            transport=transport,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+# Tolerates whitespace variations around "=" that a literal find would miss
+_YT_INIT_RE = re.compile(rb"var ytInitialData\s*=\s*")
+YT_INITIAL_DATA_END = b"};</script>"
+# Indexing bytes yields ints, so the fallback scanner compares against ordinals
+_BACKSLASH, _QUOTE, _OPEN_BRACE, _CLOSE_BRACE = ord("\\"), ord('"'), ord("{"), ord("}")
+
+_VIEW_SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+_STRIP_COMMAS = str.maketrans("", "", ",")
+_RE_NON_DIGIT_DOT = re.compile(r"[^\d.]")
+_RE_NON_DIGIT = re.compile(r"[^\d]")
+
+# Reused across scrapes so simdjson keeps its internal buffers allocated
+_simd_parser = simdjson.Parser()
+
+ERROR_LOG_WINDOW_SECONDS = 10.0
+
+
+class _ErrorLogThrottle:
+    """Collapse bursts of the same error (e.g. a 429 storm) into one line per window.
+
+    Keyed on the message template, so arguments are only formatted for records
+    that are actually emitted; the next emitted record reports how many were dropped.
+    """
+
+    def __init__(self, window: float):
+        self._window = window
+        self._last: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+
+    def error(self, msg: str, *args: Any) -> None:
+        now = time.monotonic()
+        if now - self._last.get(msg, float("-inf")) < self._window:
+            self._suppressed[msg] = self._suppressed.get(msg, 0) + 1
+            return
+        self._last[msg] = now
+        suppressed = self._suppressed.pop(msg, 0)
+        if suppressed:
+            logger.error(msg + " (%d similar suppressed)", *args, suppressed)
+        else:
+            logger.error(msg, *args)
+
 
+_request_errors = _ErrorLogThrottle(ERROR_LOG_WINDOW_SECONDS)
 
-_session = _create_session()
 
+class VideoFields(NamedTuple):
+    video_id: str
+    title: str
+    channel_name: str
+    channel_id: str
+    view_count_text: str
+    published_time: str
+    description: str
+    thumbnail: str
 
-def scrape_search(query: str, max_results: int = 20, output_format: str = "standard") -> Optional[Dict]:
-    """Scrape YouTube search results page.
+
+async def scrape_search_async(
+    query: str, max_results: int = 20, output_format: str = "standard"
+) -> Optional[Dict]:
+    """Scrape YouTube search results page over a shared HTTP/2 httpx client.
 
     Returns { estimated_results, videos[] } or None on failure.
     output_format: "standard" (snake_case, int views) or "tubebuddy" (PascalCase, text views).
+    Successful results are cached in Redis for ~6 hours per (query, max_results, format).
     """
-    url = f"https://www.youtube.com/results?search_query={quote(query)}&page=1"
+    cache_key = _scrape_cache_key(query, max_results, output_format)
+    cached = await get_cache_redis().get(cache_key)
+    if cached:
+        return orjson.loads(cached)
+
+    client = _get_async_client()
+    url = _search_url(query)
 
     try:
-        response = _session.get(url, timeout=30)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"YouTube scrape request failed: {e}")
+        for attempt in range(RETRY_TOTAL + 1):
+            try:
+                async with client.stream("GET", url) as response:
+                    if response.status_code == 200:
+                        body = await response.aread()
+                        break
+            except httpx.TransportError:
+                # Read timeouts, stream resets, ...: retried like 5xx responses
+                if attempt == RETRY_TOTAL:
+                    raise
+                await asyncio.sleep(_retry_delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                _request_errors.error("YouTube scrape request failed: HTTP %s", response.status_code)
+                return None
+            await asyncio.sleep(_retry_delay(attempt, response))
+    except httpx.HTTPError as e:
+        _request_errors.error("YouTube scrape request failed: %s", e)
         return None
 
-    yt_data = _extract_yt_initial_data(response.text)
+    result = _parse_search_page(body, max_results, output_format)
+    if result is not None:
+        # +/-10% jitter so entries written together don't all expire together
+        ttl = int(SCRAPE_CACHE_TTL_SECONDS * random.uniform(0.9, 1.1))
+        await get_cache_redis().set(cache_key, orjson.dumps(result), ex=ttl)
+    return result
+
+
+async def scrape_many(
+    queries: List[str], max_results: int = 20, output_format: str = "standard"
+) -> List[Optional[Dict]]:
+    """Scrape several queries concurrently. Results are in query order (None on failure)."""
+    return await asyncio.gather(*[
+        scrape_search_async(query, max_results, output_format) for query in queries
+    ])
+
+
+def _scrape_cache_key(query: str, max_results: int, output_format: str) -> str:
+    raw = f"{query.lower()}|{max_results}|{output_format}".encode()
+    return f"{SCRAPE_CACHE_PREFIX}{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Honor a numeric Retry-After (sent with 429s), else back off exponentially.
+
+    Capped at the longest backoff so one large Retry-After cannot outlast the
+    RQ job timeout.
+    """
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdecimal():
+        return min(float(retry_after), RETRY_DELAY_MAX)
+    return RETRY_BACKOFF * 2 ** attempt
+
+
+def _search_url(query: str) -> str:
+    return f"https://www.youtube.com/results?search_query={quote(query)}&page=1"
+
+
+def _parse_search_page(body: bytes, max_results: int, output_format: str) -> Optional[Dict]:
+    yt_data = _extract_yt_initial_data(body)
     if not yt_data:
         return None
 
-    estimated_results = _find_key_recursive(yt_data, "estimatedResults")
+    estimated_results = _get_estimated_results(yt_data)
     if not estimated_results:
         logger.warning("estimatedResults not found in ytInitialData")
         return None
 
-    renderers = _extract_video_renderers(yt_data)
+    # Lazy: only the first max_results renderers are ever walked
+    renderers = _iter_video_renderers(yt_data)
 
-    if output_format == "tubebuddy":
-        videos = _parse_videos_tubebuddy(renderers, max_results)
-    else:
-        videos = _parse_videos_standard(renderers, max_results)
+    formatter = _format_tubebuddy if output_format == "tubebuddy" else _format_standard
+    videos = _parse_videos(renderers, max_results, formatter)
 
     return {
         "estimated_results": int(estimated_results),
@@ -83,201 +240,236 @@ def scrape_search(query: str, max_results: int = 20, output_format: str = "stand
     }
 
 
-def _extract_yt_initial_data(html: str) -> Optional[Dict]:
-    marker = "var ytInitialData = "
-    start = html.find(marker)
-    if start == -1:
+def _extract_yt_initial_data(body: bytes) -> Optional[Dict]:
+    """Works on the raw response bytes: the page is never decoded to str."""
+    match = _YT_INIT_RE.search(body)
+    if not match:
         logger.warning("No ytInitialData found in YouTube page")
         return None
 
-    start += len(marker)
+    start = match.end()
+    # YouTube closes the assignment with "};</script>": a single C-level scan
+    # finds it. The per-char brace counter only runs if that payload is not a
+    # parseable object (sentinel missing, or matched inside the data).
+    end = body.find(YT_INITIAL_DATA_END, start)
+    if end != -1 and body.startswith(b"{", start):
+        try:
+            return _parse_json(body[start:end + 1])
+        except ValueError as e:
+            logger.warning("ytInitialData sentinel payload did not parse, scanning braces: %s", e)
+
+    payload = body[start:_scan_object_end(body, start)]
+    try:
+        return _parse_json(payload)
+    except ValueError as e:
+        logger.warning("simdjson failed on ytInitialData, falling back to orjson: %s", e)
+
+    try:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
+        logger.error("Failed to parse ytInitialData JSON: %s", e)
+        return None
+
+
+def _scan_object_end(body: bytes, start: int) -> int:
+    """Return the index just past the JSON object starting at body[start].
+
+    Byte-wise is safe: UTF-8 continuation bytes never collide with ASCII.
+    """
     brace_count = 0
     in_string = False
     escape = False
-    end = start
 
-    for i in range(start, len(html)):
-        char = html[i]
+    for i in range(start, len(body)):
+        char = body[i]
         if escape:
             escape = False
             continue
-        if char == "\\":
+        if char == _BACKSLASH:
             escape = True
             continue
-        if char == '"' and not escape:
+        if char == _QUOTE and not escape:
             in_string = not in_string
             continue
         if not in_string:
-            if char == "{":
+            if char == _OPEN_BRACE:
                 brace_count += 1
-            elif char == "}":
+            elif char == _CLOSE_BRACE:
                 brace_count -= 1
                 if brace_count == 0:
-                    end = i + 1
-                    break
+                    return i + 1
+
+    return start
+
 
+def _parse_json(data: bytes) -> Any:
+    """Parse with simdjson, returning lazy Object/Array proxies (values are only
+    converted to Python objects when accessed)."""
     try:
-        return json.loads(html[start:end])
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse ytInitialData JSON: {e}")
-        return None
+        return _simd_parser.parse(data)
+    except RuntimeError:
+        # The shared parser still backs a live document; use a throwaway one
+        return simdjson.Parser().parse(data)
+
+
+def _get_estimated_results(yt_data: Dict) -> Any:
+    """estimatedResults sits at the root of search pages (or next to the
+    section list); only search the whole tree if neither location has it."""
+    return (
+        _dig(yt_data, "estimatedResults", default=None)
+        or _dig(
+            yt_data,
+            "contents", "twoColumnSearchResultsRenderer", "primaryContents",
+            "sectionListRenderer", "estimatedResults",
+            default=None,
+        )
+        or _find_key(yt_data, "estimatedResults")
+    )
 
 
-def _extract_video_renderers(yt_data: Dict) -> List[Dict]:
-    contents = (
-        yt_data.get("contents", {})
-        .get("twoColumnSearchResultsRenderer", {})
-        .get("primaryContents", {})
-        .get("sectionListRenderer", {})
-        .get("contents", [])
+def _iter_video_renderers(yt_data: Dict) -> Iterator[Dict]:
+    contents = _dig(
+        yt_data,
+        "contents", "twoColumnSearchResultsRenderer", "primaryContents",
+        "sectionListRenderer", "contents",
+        default=(),
     )
 
-    renderers = []
     for section in contents:
-        for item in section.get("itemSectionRenderer", {}).get("contents", []):
-            if "videoRenderer" in item:
-                renderers.append(item["videoRenderer"])
-
-    return renderers
+        for item in _dig(section, "itemSectionRenderer", "contents", default=()):
+            renderer = item.get("videoRenderer")
+            if renderer is not None:
+                yield renderer
 
 
-def _parse_videos_standard(renderers: List[Dict], max_results: int) -> List[Dict]:
+def _parse_videos(
+    renderers: Iterable[Dict], max_results: int, formatter: Callable[[VideoFields], Dict]
+) -> List[Dict]:
     videos = []
-    for renderer in renderers[:max_results]:
-        video = _parse_video_standard(renderer)
-        if video:
-            videos.append(video)
+    for renderer in islice(renderers, max_results):
+        fields = _extract_fields(renderer)
+        if fields:
+            videos.append(formatter(fields))
     return videos
 
 
-def _parse_video_standard(renderer: Dict) -> Optional[Dict]:
+def _extract_fields(renderer: Dict) -> Optional[VideoFields]:
+    """Walk a videoRenderer once; both output formats are built from the result."""
     video_id = renderer.get("videoId")
     if not video_id:
         return None
 
-    title = renderer.get("title", {}).get("runs", [{}])[0].get("text", "")
-    channel_name = renderer.get("ownerText", {}).get("runs", [{}])[0].get("text", "")
-    channel_id = (
-        renderer.get("ownerText", {})
-        .get("runs", [{}])[0]
-        .get("navigationEndpoint", {})
-        .get("browseEndpoint", {})
-        .get("browseId", "")
+    owner_run = _dig(renderer, "ownerText", "runs", 0, default=None)
+
+    return VideoFields(
+        video_id=video_id,
+        title=_dig(renderer, "title", "runs", 0, "text"),
+        channel_name=_dig(owner_run, "text"),
+        channel_id=_dig(owner_run, "navigationEndpoint", "browseEndpoint", "browseId"),
+        view_count_text=_get_view_count_text(renderer),
+        published_time=_dig(renderer, "publishedTimeText", "simpleText"),
+        description=_get_description_snippet(renderer),
+        thumbnail=_get_best_thumbnail(renderer),
     )
 
-    view_count_text = _get_view_count_text(renderer)
-    published_time = renderer.get("publishedTimeText", {}).get("simpleText", "")
-    description_snippet = _get_description_snippet(renderer)
-    thumbnail = _get_best_thumbnail(renderer)
 
+def _format_standard(fields: VideoFields) -> Dict:
     return {
-        "video_id": video_id,
-        "title": title,
-        "channel_name": channel_name,
-        "channel_id": channel_id,
-        "views": parse_view_count(view_count_text),
-        "published_time": published_time,
-        "description_snippet": description_snippet,
-        "thumbnail": thumbnail,
+        "video_id": fields.video_id,
+        "title": fields.title,
+        "channel_name": fields.channel_name,
+        "channel_id": fields.channel_id,
+        "views": parse_view_count(fields.view_count_text),
+        "published_time": fields.published_time,
+        "description_snippet": fields.description,
+        "thumbnail": fields.thumbnail,
     }
 
 
-def _parse_videos_tubebuddy(renderers: List[Dict], max_results: int) -> List[Dict]:
-    videos = []
-    for renderer in renderers[:max_results]:
-        video = _parse_video_tubebuddy(renderer)
-        if video:
-            videos.append(video)
-    return videos
-
-
-def _parse_video_tubebuddy(renderer: Dict) -> Optional[Dict]:
-    video_id = renderer.get("videoId")
-    if not video_id:
-        return None
-
-    title = renderer.get("title", {}).get("runs", [{}])[0].get("text", "")
-    channel_name = renderer.get("ownerText", {}).get("runs", [{}])[0].get("text", "")
-    channel_id = (
-        renderer.get("ownerText", {})
-        .get("runs", [{}])[0]
-        .get("navigationEndpoint", {})
-        .get("browseEndpoint", {})
-        .get("browseId", "")
-    )
-
-    view_count_text = _get_view_count_text(renderer)
-    published_time = renderer.get("publishedTimeText", {}).get("simpleText", "")
-    description = _get_description_snippet(renderer)
-    thumbnail = _get_best_thumbnail(renderer)
-
+def _format_tubebuddy(fields: VideoFields) -> Dict:
+    video_id = fields.video_id
+    channel_id = fields.channel_id
     return {
         "Type": "video",
         "Id": video_id,
         "URL": f"https://www.youtube.com/watch?v={video_id}",
         "ChannelId": channel_id,
-        "ChannelName": channel_name,
+        "ChannelName": fields.channel_name,
         "ChannelUrl": f"https://www.youtube.com/channel/{channel_id}",
-        "Desc": description,
-        "PublishedTime": published_time,
-        "Thumbnail": thumbnail,
-        "Title": title,
-        "ViewCount": view_count_text,
+        "Desc": fields.description,
+        "PublishedTime": fields.published_time,
+        "Thumbnail": fields.thumbnail,
+        "Title": fields.title,
+        "ViewCount": fields.view_count_text,
     }
 
 
 def _get_view_count_text(renderer: Dict) -> str:
-    text = renderer.get("viewCountText", {}).get("simpleText", "")
-    if not text:
-        text = renderer.get("shortViewCountText", {}).get("simpleText", "")
-    return text
+    return (
+        _dig(renderer, "viewCountText", "simpleText")
+        or _dig(renderer, "shortViewCountText", "simpleText")
+    )
 
 
 def _get_description_snippet(renderer: Dict) -> str:
-    runs = (
-        renderer.get("detailedMetadataSnippets", [{}])[0]
-        .get("snippetText", {})
-        .get("runs", [])
-    )
+    runs = _dig(renderer, "detailedMetadataSnippets", 0, "snippetText", "runs", default=())
     return "".join(r.get("text", "") for r in runs)
 
 
 def _get_best_thumbnail(renderer: Dict) -> str:
-    thumbnails = renderer.get("thumbnail", {}).get("thumbnails", [])
-    return thumbnails[-1].get("url", "") if thumbnails else ""
-
-
-def _find_key_recursive(data: Any, key: str) -> Any:
-    if isinstance(data, dict):
-        if key in data:
-            return data[key]
-        for value in data.values():
-            result = _find_key_recursive(value, key)
-            if result is not None:
-                return result
-    elif isinstance(data, list):
-        for item in data:
-            result = _find_key_recursive(item, key)
-            if result is not None:
-                return result
+    return _dig(renderer, "thumbnail", "thumbnails", -1, "url")
+
+
+def _dig(node: Any, *path: Any, default: Any = "") -> Any:
+    """Follow path (keys and list indexes) into nested JSON, returning default
+    as soon as a step is missing or null. Replaces chained .get(key, {}) calls,
+    which allocate a throwaway dict at every level."""
+    for step in path:
+        try:
+            node = node[step]
+        except (KeyError, IndexError, TypeError):
+            return default
+        if node is None:
+            return default
+    return node
+
+
+def _find_key(data: Any, key: str) -> Any:
+    """Depth-first search for the first value stored under key (same order as a
+    recursive walk, but with an explicit stack instead of Python frames)."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (dict, simdjson.Object)):
+            if key in node:
+                value = node[key]
+                if value is not None:
+                    return value
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, (list, simdjson.Array)):
+            stack.extend(reversed(list(node)))
     return None
 
 
+# View-count strings repeat heavily across scrapes ("No views", "1.2M views", ...)
+@lru_cache(maxsize=4096)
 def parse_view_count(text: str) -> int:
     """Parse YouTube view count text to int. Ex: '1,234 views' -> 1234, '1.2M views' -> 1200000."""
     if not text:
         return 0
-    text = text.lower().replace(",", "").replace(" views", "").replace(" view", "").strip()
+    text = text.lower().translate(_STRIP_COMMAS).strip().removesuffix(" views").removesuffix(" view").strip()
+    if text.isdecimal():
+        return int(text)
     if not text or text == "no":
         return 0
 
-    multipliers = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
-    for suffix, multiplier in multipliers.items():
-        if text.endswith(suffix):
-            numbers = re.sub(r"[^\d.]", "", text[:-1])
-            if numbers:
-                return int(float(numbers) * multiplier)
-            return 0
+    multiplier = _VIEW_SUFFIXES.get(text[-1])
+    if multiplier:
+        numbers = _RE_NON_DIGIT_DOT.sub("", text[:-1])
+        if numbers:
+            return int(float(numbers) * multiplier)
+        return 0
 
-    numbers = re.sub(r"[^\d]", "", text)
+    numbers = _RE_NON_DIGIT.sub("", text)
     return int(numbers) if numbers else 0
@@ -1,8 +1,11 @@
 import logging
 import os
 
-import redis
-from rq import Queue, Worker
+from rq import SimpleWorker
+from rq.worker_pool import WorkerPool
+
+from app.core.redis import REDIS_URL, get_rq_redis
+from app.services.enqueue import get_queue
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,15 +14,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-REDIS_URL = os.getenv("REDIS_URL")
-if not REDIS_URL:
-    raise ValueError("REDIS_URL environment variable is required")
+# Jobs are I/O-bound, so scale with processes rather than per-job forks:
+# each process runs a SimpleWorker that executes jobs in-process.
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
 
-redis_conn = redis.from_url(REDIS_URL)
-queue = Queue("youtube_fetch_jobs", connection=redis_conn)
+# Same pooled client (and queue definition) the API enqueues through
+redis_conn = get_rq_redis()
+queue = get_queue()
 
 if __name__ == "__main__":
     logger.info("Starting youtube-fetcher worker...")
     logger.info(f"Redis: {REDIS_URL}")
-    worker = Worker(queues=[queue], connection=redis_conn)
-    worker.work()
+    if WORKER_PROCESSES > 1:
+        logger.info(f"Worker processes: {WORKER_PROCESSES}")
+        pool = WorkerPool(
+            queues=[queue],
+            connection=redis_conn,
+            num_workers=WORKER_PROCESSES,
+            worker_class=SimpleWorker,
+        )
+        pool.start()
+    else:
+        worker = SimpleWorker(queues=[queue], connection=redis_conn)
+        worker.work()